@@ -4,18 +4,34 @@ RuleKeeper PDF Generator
 Generates two PDF documents:
 1. Quick Reference Lookup - Complete list of all policies
 2. Detailed Policy Guide - Full descriptions with examples
+
+The script only needs fpdf2, which is pure Python, so it runs unchanged
+under PyPy. For batch regeneration `pypy3 generate_pdfs.py` is the
+recommended invocation; CPython works the same, just slower.
 """
 
-from fpdf import FPDF
+import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from fpdf import FPDF, FPDF_VERSION
+from fpdf.drawing import DeviceRGB
 from fpdf.enums import XPos, YPos
+from fpdf.syntax import PDFContentStream
 from pathlib import Path
+from types import MappingProxyType
+
+
+# Generated PDFs are written next to this script
+_BASE_DIR = Path(__file__).resolve().parent
 
 
 # =============================================================================
 # POLICY DATA
 # =============================================================================
-CATEGORIES = [
-    ("naming_conventions", "Naming Conventions", [
+CATEGORIES = (
+    ("naming_conventions", "Naming Conventions", (
         ("CS-NAME-001", "Class/Interface Naming", "Classes and Interfaces must use PascalCase", "high"),
         ("CS-NAME-002", "Method Naming", "Methods must use PascalCase", "high"),
         ("CS-NAME-003", "Variable/Field/Parameter Naming", "Variables, fields, and parameters must use camelCase", "high"),
@@ -26,21 +42,21 @@ CATEGORIES = [
         ("CS-NAME-008", "Request/Response DTO Naming", "Request and Response DTOs must end with Request or Response suffix", "high"),
         ("CS-NAME-009", "Boolean Variable Naming", "Boolean variables should use is/has/can/should prefixes", "medium"),
         ("CS-NAME-010", "Event Handler Naming", "Event handlers should follow 'On' + EventName pattern", "medium"),
-    ]),
-    ("file_organization", "File & Project Organization", [
+    )),
+    ("file_organization", "File & Project Organization", (
         ("CS-FILE-001", "One Class Per File", "Each file should contain only one class", "medium"),
         ("CS-FILE-002", "File Name Matches Class", "File name must match the class name it contains", "high"),
         ("CS-FILE-003", "Feature-Based Organization", "Group files logically by feature, not layer (vertical slicing)", "medium"),
         ("CS-FILE-004", "Namespace Matches Folder Structure", "Namespace should reflect the folder structure", "medium"),
-    ]),
-    ("method_design", "Method Design & Readability", [
+    )),
+    ("method_design", "Method Design & Readability", (
         ("CS-METHOD-001", "Single Responsibility", "Methods should be small and do one thing", "high"),
         ("CS-METHOD-002", "Method Length", "Keep method length at or below 30 lines", "medium"),
         ("CS-METHOD-003", "Parameter Count", "Avoid long parameter lists - use DTOs instead", "medium"),
         ("CS-METHOD-004", "Cyclomatic Complexity", "Methods should have low cyclomatic complexity", "medium"),
         ("CS-METHOD-005", "No Nested Ternary", "Avoid nested ternary operators", "medium"),
-    ]),
-    ("secure_coding", "Secure Coding Practices", [
+    )),
+    ("secure_coding", "Secure Coding Practices", (
         ("CS-SEC-001", "Parameterized Queries", "Never concatenate SQL or user inputs - use parameterized queries", "critical"),
         ("CS-SEC-002", "Input Validation", "Always validate user input", "critical"),
         ("CS-SEC-003", "Log Sanitization", "Sanitize logs - no sensitive data (PIN, password, token)", "critical"),
@@ -49,102 +65,105 @@ CATEGORIES = [
         ("CS-SEC-006", "No Hardcoded Credentials", "Never hardcode credentials in source code", "critical"),
         ("CS-SEC-007", "XSS Prevention", "Sanitize output to prevent Cross-Site Scripting", "critical"),
         ("CS-SEC-008", "Path Traversal Prevention", "Validate file paths to prevent directory traversal", "critical"),
-    ]),
-    ("exception_handling", "Exception Handling & Logging", [
+    )),
+    ("exception_handling", "Exception Handling & Logging", (
         ("CS-EXC-001", "Meaningful Exception Handling", "Use try-catch only where you can handle errors meaningfully", "high"),
         ("CS-EXC-002", "Contextual Logging", "Log exceptions with context, but not sensitive data", "high"),
         ("CS-EXC-003", "No Empty Catch Blocks", "Avoid empty catch blocks", "critical"),
         ("CS-EXC-004", "Domain Exceptions", "Throw domain-specific exceptions when needed", "medium"),
         ("CS-EXC-005", "No Catch-All Without Rethrow", "Catching all exceptions should rethrow or terminate", "high"),
-    ]),
-    ("async_programming", "Asynchronous Programming", [
+    )),
+    ("async_programming", "Asynchronous Programming", (
         ("CS-ASYNC-001", "Always Await", "Always await async calls", "high"),
         ("CS-ASYNC-002", "No Blocking Async", "Don't block async with .Result or .Wait()", "critical"),
         ("CS-ASYNC-003", "ConfigureAwait in Libraries", "Use ConfigureAwait(false) in library code", "medium"),
         ("CS-ASYNC-004", "Async Void Avoidance", "Avoid async void except for event handlers", "high"),
         ("CS-ASYNC-005", "Proper Cancellation Token Usage", "Async methods should accept and use CancellationToken", "medium"),
-    ]),
-    ("dependency_injection", "Dependency Injection & SOLID", [
+    )),
+    ("dependency_injection", "Dependency Injection & SOLID", (
         ("CS-DI-001", "Depend on Abstractions", "Depend on interfaces, not concrete types", "high"),
         ("CS-DI-002", "Use IoC Container", "Use built-in IServiceCollection or IoC containers", "high"),
         ("CS-DI-003", "Avoid New in Business Logic", "Avoid 'new' keyword for dependencies inside business logic", "high"),
         ("CS-DI-004", "Constructor Injection Only", "Use constructor injection, not property or method injection", "medium"),
         ("CS-DI-005", "Service Lifetime Consistency", "Ensure consistent service lifetimes in DI registration", "high"),
-    ]),
-    ("constants", "Constants & Magic Numbers", [
+    )),
+    ("constants", "Constants & Magic Numbers", (
         ("CS-CONST-001", "No Magic Numbers", "Avoid magic numbers or strings in code", "medium"),
         ("CS-CONST-002", "Use Named Constants", "Use named constants or enums instead of literals", "medium"),
         ("CS-CONST-003", "No Magic Strings", "Avoid magic strings in code", "medium"),
-    ]),
-    ("data_validation", "Data Validation", [
+    )),
+    ("data_validation", "Data Validation", (
         ("CS-VAL-001", "DTO Validation", "Always validate input DTOs using attributes or FluentValidation", "high"),
         ("CS-VAL-002", "Client and Server Validation", "Validate both client and server side", "high"),
         ("CS-VAL-003", "Null Checks", "Check for null before using objects", "high"),
         ("CS-VAL-004", "Guard Clauses", "Use guard clauses for parameter validation", "medium"),
-    ]),
-    ("logging", "Logging Standards", [
+    )),
+    ("logging", "Logging Standards", (
         ("CS-LOG-001", "Structured Logging", "Use structured logging", "high"),
         ("CS-LOG-002", "No Sensitive Data in Logs", "Never log sensitive data (PIN, password, token)", "critical"),
         ("CS-LOG-003", "Appropriate Log Levels", "Log at appropriate levels (Info, Warning, Error, Critical)", "medium"),
         ("CS-LOG-004", "Include Correlation ID", "Include correlation/trace ID in logs for distributed tracing", "medium"),
-    ]),
-    ("documentation", "Code Comments & Documentation", [
+    )),
+    ("documentation", "Code Comments & Documentation", (
         ("CS-DOC-001", "XML Comments for Public APIs", "Use XML comments for public APIs", "medium"),
         ("CS-DOC-002", "Comment Why Not What", "Comment why, not what - avoid redundant comments", "low"),
         ("CS-DOC-003", "TODO Comments", "TODO comments should include ticket/issue reference", "low"),
-    ]),
-    ("immutability", "Immutability & Defensive Coding", [
+    )),
+    ("immutability", "Immutability & Defensive Coding", (
         ("CS-IMM-001", "Use Readonly", "Use readonly for fields that don't change after construction", "medium"),
         ("CS-IMM-002", "No Mutable Collections", "Avoid exposing mutable collections", "medium"),
         ("CS-IMM-003", "Clone External Data", "Clone or copy external data inputs", "medium"),
         ("CS-IMM-004", "Use Records for DTOs", "Consider using records for immutable DTOs", "low"),
-    ]),
-    ("secure_configuration", "Secure Configuration", [
+    )),
+    ("secure_configuration", "Secure Configuration", (
         ("CS-CFG-001", "No Secrets in Source", "No secrets in source code or appsettings.json", "critical"),
         ("CS-CFG-002", "Use Secret Managers", "Use environment variables or secret managers", "critical"),
         ("CS-CFG-003", "Secure Connection Strings", "Connection strings should use integrated security or managed identity", "high"),
-    ]),
-    ("secure_strings", "Secure String Handling", [
+    )),
+    ("secure_strings", "Secure String Handling", (
         ("CS-STR-001", "No Plain Text Secrets", "Avoid keeping secrets as plain strings in memory", "high"),
         ("CS-STR-002", "Use SecureString", "Use SecureString or encrypt secrets in memory", "high"),
-    ]),
-    ("unit_testing", "Unit Testing Standards", [
+    )),
+    ("unit_testing", "Unit Testing Standards", (
         ("CS-TEST-001", "Test Naming Convention", "Use clear test names: MethodName_StateUnderTest_ExpectedBehavior", "medium"),
         ("CS-TEST-002", "Single Assertion", "Prefer one logical assertion per test", "low"),
         ("CS-TEST-003", "No External Dependencies", "No dependency on external systems in unit tests", "high"),
         ("CS-TEST-004", "Arrange-Act-Assert Pattern", "Tests should follow Arrange-Act-Assert pattern", "low"),
         ("CS-TEST-005", "Test Class Naming", "Test classes should be named {ClassName}Tests", "low"),
-    ]),
-    ("cors", "CORS Configuration", [
+    )),
+    ("cors", "CORS Configuration", (
         ("API-CORS-001", "Specific CORS Origins", "Configure CORS with specific allowed origins, not AllowAnyOrigin", "critical"),
         ("API-CORS-002", "No Credentials with Any Origin", "AllowCredentials cannot be used with AllowAnyOrigin", "critical"),
-    ]),
-    ("api_design", "API Design", [
+    )),
+    ("api_design", "API Design", (
         ("API-REST-001", "RESTful Endpoints", "Use proper HTTP methods for CRUD operations", "high"),
         ("API-HTTP-001", "Appropriate Status Codes", "Return appropriate HTTP status codes", "high"),
         ("API-VER-001", "API Versioning", "Implement API versioning in routes", "high"),
         ("API-RESP-001", "Consistent Response Format", "Use a consistent API response wrapper", "medium"),
         ("API-DOC-001", "Endpoint Documentation", "Document API endpoints with XML comments and response types", "medium"),
-    ]),
-    ("encryption", "Encryption", [
+    )),
+    ("encryption", "Encryption", (
         ("API-ENC-001", "Proper RSA Encryption", "Use proper RSA encryption with OAEP padding", "critical"),
         ("API-ENC-002", "Strong Hashing Algorithms", "Use SHA-256 or stronger for hashing", "critical"),
-    ]),
-    ("idempotency", "Idempotency", [
+    )),
+    ("idempotency", "Idempotency", (
         ("API-IDEMP-001", "Idempotency Keys", "Use idempotency keys for financial operations", "critical"),
-    ]),
-    ("authentication", "Authentication & Authorization", [
+    )),
+    ("authentication", "Authentication & Authorization", (
         ("API-AUTH-001", "Endpoint Authorization", "Protect endpoints with proper authorization", "critical"),
         ("API-AUTH-002", "Resource-Level Authorization", "Verify user has access to specific resources", "critical"),
-    ]),
-    ("error_handling", "Error Handling", [
+    )),
+    ("error_handling", "Error Handling", (
         ("API-ERR-001", "Domain Exception Handling", "Handle domain-specific exceptions with appropriate responses", "high"),
         ("API-SAN-001", "Input Sanitization", "Sanitize all user inputs before processing", "critical"),
-    ]),
-    ("rate_limiting", "Rate Limiting", [
+    )),
+    ("rate_limiting", "Rate Limiting", (
         ("API-RATE-001", "Rate Limiting", "Implement rate limiting on API endpoints", "high"),
-    ]),
-]
+    )),
+)
+
+# Flat (rule_id, name, severity) list across all categories, in catalog order
+ALL_RULES = tuple((rule[0], rule[1], rule[3]) for _, _, rules in CATEGORIES for rule in rules)
 
 # Detailed examples for the detailed guide
 DETAILED_RULES = {
@@ -240,15 +259,214 @@ DETAILED_RULES = {
     },
 }
 
+# Shared read-only stand-in for rules without DETAILED_RULES entries
+_EMPTY = MappingProxyType({})
+
+# DETAILED_RULES entries in ALL_RULES order (_EMPTY where a rule has no details)
+DETAILED_LIST = tuple(DETAILED_RULES.get(rule_id, _EMPTY) for rule_id, _, _ in ALL_RULES)
+
 
 # =============================================================================
 # PDF 1: QUICK REFERENCE LOOKUP
 # =============================================================================
-class QuickReferencePDF(FPDF):
-    def __init__(self):
+def _device_rgb(r, g, b):
+    return DeviceRGB(r / 255, g / 255, b / 255)
+
+
+# Row fills are built as fpdf2 colour objects up front, so the per-row
+# set_fill_color call needs no tuple unpacking or 0-255 conversion
+_SEVERITY_FILL = {
+    'critical': _device_rgb(255, 230, 230),
+    'high': _device_rgb(255, 243, 224),
+    'medium': _device_rgb(255, 249, 219),
+    'low': _device_rgb(232, 245, 233),
+}
+_DEFAULT_FILL = _device_rgb(255, 255, 255)
+
+_SEVERITY_SHORT = {
+    'critical': 'CRIT',
+    'high': 'HIGH',
+    'medium': 'MEDI',
+    'low': 'LOW',
+}
+
+# (label, badge colour, indented description) for the title page legend
+_SEVERITY_LEGEND = tuple((name, _device_rgb(*color), f"  {desc}") for name, color, desc in (
+    ("CRITICAL", (220, 53, 69), "Block deployment - Security/compliance risk"),
+    ("HIGH", (255, 153, 0), "Fix before deployment"),
+    ("MEDIUM", (255, 193, 7), "Address in current sprint"),
+    ("LOW", (40, 167, 69), "Best practice recommendation"),
+))
+
+YAML_OPTIONS = (
+    ("id", "string", "Unique identifier for the rule"),
+    ("name", "string", "Human-readable rule name"),
+    ("description", "string", "Detailed description of what the rule enforces"),
+    ("severity", "critical|high|medium|low", "Severity level of violations"),
+    ("enabled", "true|false", "Whether the rule is active"),
+    ("skip", "true|false", "Skip this rule during scanning"),
+    ("pattern", "regex", "Regex pattern for matching valid code"),
+    ("anti_pattern", "regex", "Regex pattern that indicates violations"),
+    ("applies_to", "list", "Code elements this rule applies to"),
+    ("file_pattern", "glob", "Glob pattern for files to scan"),
+    ("custom_validator", "string", "Name of custom validation function"),
+    ("prebuilt", "string", "Reference to prebuilt policy template"),
+    ("message", "string", "Custom message on violation"),
+    ("fix_hint", "string", "Suggestion for fixing the violation"),
+    ("examples.good", "string", "Example of correct code"),
+    ("examples.bad", "string", "Example of incorrect code"),
+    ("tags", "list", "Tags for categorization"),
+    ("parameters", "object", "Additional parameters for validators"),
+)
+
+PREBUILT_POLICIES = (
+    ("dotnet_naming", "Standard .NET naming conventions",
+     "CS-NAME-001 through CS-NAME-007"),
+    ("security_essentials", "Essential security rules for financial apps",
+     "CS-SEC-001-005, CS-CFG-001-002, API-AUTH-001-002, API-SAN-001"),
+    ("async_best_practices", "Async/await best practices",
+     "CS-ASYNC-001 through CS-ASYNC-003"),
+    ("api_security", "API security standards",
+     "API-CORS-001, API-VAL-001, API-ENC-001, API-AUTH-001-002, API-RATE-001"),
+)
+
+CUSTOM_VALIDATORS = (
+    ("ValidatePasswordComplexity", "Validates password meets complexity requirements"),
+    ("ValidateAccountNumber", "Validates account number format"),
+    ("ScanForSecrets", "Scans for potential secrets in code"),
+    ("DetectSqlInjection", "Detects potential SQL injection vulnerabilities"),
+    ("DetectSensitiveLogging", "Detects sensitive data in log statements"),
+    ("ValidateSingleClassPerFile", "Validates one class per file"),
+    ("ValidateMethodLength", "Validates method length constraints"),
+    ("ValidateCyclomaticComplexity", "Validates cyclomatic complexity"),
+)
+
+
+def _trunc(text, keep, limit):
+    return text[:keep] + "..." if len(text) > limit else text
+
+
+# Table rows with truncation and severity styling resolved once at import
+CATEGORIES_RENDER = tuple(
+    (cat_id, cat_name, tuple(
+        (_SEVERITY_FILL.get(severity, _DEFAULT_FILL),
+         (rule_id, _trunc(name, 25, 28), _trunc(desc, 60, 63),
+          _SEVERITY_SHORT.get(severity) or severity.upper()[:4]))
+        for rule_id, name, desc, severity in rules
+    ))
+    for cat_id, cat_name, rules in CATEGORIES
+)
+
+# "Complete Policy ID List" page: 3 columns of (x, y, label) slots
+_ID_LIST_COL_WIDTH = 63
+_ID_LIST_ROW_HEIGHT = 5
+_ID_LIST_ITEMS_PER_COL = (len(ALL_RULES) + 2) // 3
+_ID_LIST_ITEMS = tuple(
+    (10 + (i // _ID_LIST_ITEMS_PER_COL) * _ID_LIST_COL_WIDTH,
+     40 + (i % _ID_LIST_ITEMS_PER_COL) * _ID_LIST_ROW_HEIGHT,
+     f"{rule_id}: {name[:20]}")
+    for i, (rule_id, name, severity) in enumerate(ALL_RULES)
+    if i // _ID_LIST_ITEMS_PER_COL < 3
+)
+
+_HEADER_FILL = (240, 240, 240)
+_RULE_COLUMNS = (28, 45, 100, 17)
+_RULE_ROW_HEIGHT = 6
+_OPTION_COLUMNS = (40, 45, 105)
+_PREBUILT_COLUMNS = (40, 60, 90)
+_VALIDATOR_COLUMNS = (60, 130)
+
+
+def _emit_row(pdf, widths, cells, h, fill=False, align='L'):
+    """Write one bordered table row; `align` applies to the last column."""
+    last = len(widths) - 1
+    for w, text in zip(widths[:last], cells):
+        pdf.cell(w, h, text, border=1, fill=fill)
+    pdf.cell(widths[last], h, cells[last], border=1, fill=fill, align=align,
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+
+def _report(message):
+    # The generators run in parallel workers sharing stdout; print() writes the
+    # text and its newline separately, so emit the whole line in one write
+    print(message + "\n", end="", flush=True)
+
+
+def _write_pdf(pdf, output_path):
+    """Serialise `pdf` in memory and write it out with a single write call."""
+    data = pdf.output()
+    # Drop the old digest first: if the write below fails partway, a stale
+    # digest would make --cached trust the truncated PDF from then on
+    _digest_path(output_path).unlink(missing_ok=True)
+    output_path.write_bytes(data)
+
+
+@lru_cache(maxsize=None)
+def _source_digest():
+    # The script holds both the policy data and the layout code, so hashing
+    # it (plus the fpdf2 version) captures everything that shapes the output
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(FPDF_VERSION.encode())
+    return digest.hexdigest()
+
+
+def _digest_path(output_path):
+    return output_path.with_name(output_path.name + ".sha")
+
+
+def _is_cached(output_path):
+    """True if `output_path` was generated from the current script."""
+    digest_path = _digest_path(output_path)
+    return (output_path.exists() and digest_path.exists()
+            and digest_path.read_text().strip() == _source_digest())
+
+
+def _record_digest(output_path):
+    _digest_path(output_path).write_text(_source_digest() + "\n")
+
+
+class _StateCachingPDF(FPDF):
+    """FPDF that returns early from font changes matching the current state."""
+
+    def set_font(self, family=None, style='', size=0):
+        if (family and size == self.font_size_pt and style == self.font_style
+                and family.lower() == self.font_family
+                and not (self.underline or self.strikethrough)):
+            return
+        super().set_font(family, style, size)
+
+
+class _RuleKeeperPDF(_StateCachingPDF):
+    """Page setup, footer and output compression shared by both guides."""
+
+    # alias_nb_pages() placeholder for the total page count
+    _FOOTER_TAIL = '/{nb}'
+
+    def __init__(self, compress_level=1):
         super().__init__()
         self.set_auto_page_break(auto=True, margin=15)
+        # zlib level for page content streams; 1 is several times faster
+        # than fpdf2's default of 6 for a few percent larger output
+        self.compress_level = compress_level
+
+    def output(self, *args, **kwargs):
+        # fpdf2 reads the level from a PDFContentStream class attribute while
+        # serialising, so apply ours only for the duration of this call
+        default_level = PDFContentStream._COMPRESSION_LEVEL
+        PDFContentStream._COMPRESSION_LEVEL = self.compress_level
+        try:
+            return super().output(*args, **kwargs)
+        finally:
+            PDFContentStream._COMPRESSION_LEVEL = default_level
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Helvetica', 'I', 8)
+        self.set_text_color(128)
+        self.cell(0, 10, 'Page ' + str(self.page_no()) + self._FOOTER_TAIL, align='C')
+
 
+class QuickReferencePDF(_RuleKeeperPDF):
     def header(self):
         if self.page_no() > 1:
             self.set_font('Helvetica', 'B', 9)
@@ -256,14 +474,13 @@ class QuickReferencePDF(FPDF):
             self.cell(0, 8, 'RuleKeeper - Quick Reference', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             self.ln(2)
 
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Helvetica', 'I', 8)
-        self.set_text_color(128)
-        self.cell(0, 10, f'Page {self.page_no()}/{{nb}}', align='C')
 
+def generate_quick_reference(cached=False):
+    output_path = _BASE_DIR / "RuleKeeper_Quick_Reference.pdf"
+    if cached and _is_cached(output_path):
+        _report(f"Quick Reference PDF up to date: {output_path}")
+        return output_path
 
-def generate_quick_reference():
     pdf = QuickReferencePDF()
     pdf.alias_nb_pages()
 
@@ -296,60 +513,45 @@ def generate_quick_reference():
     pdf.cell(0, 8, 'Severity Levels:', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(2)
 
-    severities = [
-        ("CRITICAL", (220, 53, 69), "Block deployment - Security/compliance risk"),
-        ("HIGH", (255, 153, 0), "Fix before deployment"),
-        ("MEDIUM", (255, 193, 7), "Address in current sprint"),
-        ("LOW", (40, 167, 69), "Best practice recommendation"),
-    ]
-
-    for name, color, desc in severities:
-        pdf.set_fill_color(*color)
+    for name, color, desc in _SEVERITY_LEGEND:
+        pdf.set_fill_color(color)
         pdf.set_text_color(255)
         pdf.set_font('Helvetica', 'B', 9)
         pdf.cell(25, 6, name, fill=True)
         pdf.set_text_color(0)
         pdf.set_font('Helvetica', '', 9)
-        pdf.cell(0, 6, f"  {desc}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(0, 6, desc, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     # Policy Tables
-    for cat_id, cat_name, rules in CATEGORIES:
+    for cat_id, cat_name, rows in CATEGORIES_RENDER:
         pdf.add_page()
         pdf.set_font('Helvetica', 'B', 14)
         pdf.set_text_color(0, 51, 102)
         pdf.cell(0, 10, cat_name, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.ln(2)
 
-        # Table Header
-        pdf.set_fill_color(240, 240, 240)
-        pdf.set_font('Helvetica', 'B', 8)
-        pdf.set_text_color(0)
-        pdf.cell(28, 7, 'ID', border=1, fill=True)
-        pdf.cell(45, 7, 'Name', border=1, fill=True)
-        pdf.cell(100, 7, 'Description', border=1, fill=True)
-        pdf.cell(17, 7, 'Severity', border=1, fill=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-        # Table Rows
-        pdf.set_font('Helvetica', '', 7)
-        for rule_id, name, desc, severity in rules:
-            # Severity color
-            severity_colors = {
-                'critical': (255, 230, 230),
-                'high': (255, 243, 224),
-                'medium': (255, 249, 219),
-                'low': (232, 245, 233)
-            }
-            pdf.set_fill_color(*severity_colors.get(severity, (255, 255, 255)))
-
-            # Truncate if needed
-            name_short = name[:25] + "..." if len(name) > 28 else name
-            desc_short = desc[:60] + "..." if len(desc) > 63 else desc
-
-            pdf.cell(28, 6, rule_id, border=1, fill=True)
-            pdf.cell(45, 6, name_short, border=1, fill=True)
-            pdf.cell(100, 6, desc_short, border=1, fill=True)
-            pdf.cell(17, 6, severity.upper()[:4], border=1, fill=True, align='C',
-                     new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        # Split the rows at known page boundaries up front, repeating the
+        # table header on each continuation page. cell()'s own auto page
+        # break stays enabled as a fallback.
+        start = 0
+        while True:
+            # Table Header
+            pdf.set_fill_color(*_HEADER_FILL)
+            pdf.set_font('Helvetica', 'B', 8)
+            pdf.set_text_color(0)
+            _emit_row(pdf, _RULE_COLUMNS, ('ID', 'Name', 'Description', 'Severity'), 7, fill=True)
+
+            # Table Rows
+            rows_per_page = max(1, int((pdf.page_break_trigger - pdf.y) // _RULE_ROW_HEIGHT))
+            pdf.set_font('Helvetica', '', 7)
+            for fill, cells in rows[start:start + rows_per_page]:
+                pdf.set_fill_color(fill)
+                _emit_row(pdf, _RULE_COLUMNS, cells, _RULE_ROW_HEIGHT, fill=True, align='C')
+
+            start += rows_per_page
+            if start >= len(rows):
+                break
+            pdf.add_page()
 
     # YAML Configuration Options Page
     pdf.add_page()
@@ -358,38 +560,13 @@ def generate_quick_reference():
     pdf.cell(0, 10, 'YAML Configuration Options', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(2)
 
-    options = [
-        ("id", "string", "Unique identifier for the rule"),
-        ("name", "string", "Human-readable rule name"),
-        ("description", "string", "Detailed description of what the rule enforces"),
-        ("severity", "critical|high|medium|low", "Severity level of violations"),
-        ("enabled", "true|false", "Whether the rule is active"),
-        ("skip", "true|false", "Skip this rule during scanning"),
-        ("pattern", "regex", "Regex pattern for matching valid code"),
-        ("anti_pattern", "regex", "Regex pattern that indicates violations"),
-        ("applies_to", "list", "Code elements this rule applies to"),
-        ("file_pattern", "glob", "Glob pattern for files to scan"),
-        ("custom_validator", "string", "Name of custom validation function"),
-        ("prebuilt", "string", "Reference to prebuilt policy template"),
-        ("message", "string", "Custom message on violation"),
-        ("fix_hint", "string", "Suggestion for fixing the violation"),
-        ("examples.good", "string", "Example of correct code"),
-        ("examples.bad", "string", "Example of incorrect code"),
-        ("tags", "list", "Tags for categorization"),
-        ("parameters", "object", "Additional parameters for validators"),
-    ]
-
     pdf.set_font('Helvetica', 'B', 8)
-    pdf.set_fill_color(240, 240, 240)
-    pdf.cell(40, 7, 'Option', border=1, fill=True)
-    pdf.cell(45, 7, 'Type', border=1, fill=True)
-    pdf.cell(105, 7, 'Description', border=1, fill=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_fill_color(*_HEADER_FILL)
+    _emit_row(pdf, _OPTION_COLUMNS, ('Option', 'Type', 'Description'), 7, fill=True)
 
     pdf.set_font('Helvetica', '', 8)
-    for opt, typ, desc in options:
-        pdf.cell(40, 6, opt, border=1)
-        pdf.cell(45, 6, typ, border=1)
-        pdf.cell(105, 6, desc, border=1, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    for option in YAML_OPTIONS:
+        _emit_row(pdf, _OPTION_COLUMNS, option, 6)
 
     # Prebuilt Policies
     pdf.add_page()
@@ -398,28 +575,13 @@ def generate_quick_reference():
     pdf.cell(0, 10, 'Prebuilt Policy Templates', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(2)
 
-    prebuilts = [
-        ("dotnet_naming", "Standard .NET naming conventions",
-         "CS-NAME-001 through CS-NAME-007"),
-        ("security_essentials", "Essential security rules for financial apps",
-         "CS-SEC-001-005, CS-CFG-001-002, API-AUTH-001-002, API-SAN-001"),
-        ("async_best_practices", "Async/await best practices",
-         "CS-ASYNC-001 through CS-ASYNC-003"),
-        ("api_security", "API security standards",
-         "API-CORS-001, API-VAL-001, API-ENC-001, API-AUTH-001-002, API-RATE-001"),
-    ]
-
     pdf.set_font('Helvetica', 'B', 8)
-    pdf.set_fill_color(240, 240, 240)
-    pdf.cell(40, 7, 'Template', border=1, fill=True)
-    pdf.cell(60, 7, 'Description', border=1, fill=True)
-    pdf.cell(90, 7, 'Includes', border=1, fill=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_fill_color(*_HEADER_FILL)
+    _emit_row(pdf, _PREBUILT_COLUMNS, ('Template', 'Description', 'Includes'), 7, fill=True)
 
     pdf.set_font('Helvetica', '', 8)
-    for name, desc, includes in prebuilts:
-        pdf.cell(40, 6, name, border=1)
-        pdf.cell(60, 6, desc, border=1)
-        pdf.cell(90, 6, includes, border=1, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    for prebuilt in PREBUILT_POLICIES:
+        _emit_row(pdf, _PREBUILT_COLUMNS, prebuilt, 6)
 
     # Custom Validators
     pdf.ln(10)
@@ -428,26 +590,13 @@ def generate_quick_reference():
     pdf.cell(0, 10, 'Custom Validators', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(2)
 
-    validators = [
-        ("ValidatePasswordComplexity", "Validates password meets complexity requirements"),
-        ("ValidateAccountNumber", "Validates account number format"),
-        ("ScanForSecrets", "Scans for potential secrets in code"),
-        ("DetectSqlInjection", "Detects potential SQL injection vulnerabilities"),
-        ("DetectSensitiveLogging", "Detects sensitive data in log statements"),
-        ("ValidateSingleClassPerFile", "Validates one class per file"),
-        ("ValidateMethodLength", "Validates method length constraints"),
-        ("ValidateCyclomaticComplexity", "Validates cyclomatic complexity"),
-    ]
-
     pdf.set_font('Helvetica', 'B', 8)
-    pdf.set_fill_color(240, 240, 240)
-    pdf.cell(60, 7, 'Validator', border=1, fill=True)
-    pdf.cell(130, 7, 'Description', border=1, fill=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_fill_color(*_HEADER_FILL)
+    _emit_row(pdf, _VALIDATOR_COLUMNS, ('Validator', 'Description'), 7, fill=True)
 
     pdf.set_font('Helvetica', '', 8)
-    for name, desc in validators:
-        pdf.cell(60, 6, name, border=1)
-        pdf.cell(130, 6, desc, border=1, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    for validator in CUSTOM_VALIDATORS:
+        _emit_row(pdf, _VALIDATOR_COLUMNS, validator, 6)
 
     # All Policies Summary Page
     pdf.add_page()
@@ -459,37 +608,72 @@ def generate_quick_reference():
     pdf.set_font('Courier', '', 7)
     pdf.set_text_color(0)
 
-    all_rules = []
-    for cat_id, cat_name, rules in CATEGORIES:
-        for rule in rules:
-            all_rules.append((rule[0], rule[1], rule[3]))
-
-    # 3 columns
-    col_width = 63
-    items_per_col = (len(all_rules) + 2) // 3
-
-    for i, (rule_id, name, severity) in enumerate(all_rules):
-        col = i // items_per_col
-        row = i % items_per_col
-        if col < 3:
-            x = 10 + col * col_width
-            y = 40 + row * 5
-            pdf.set_xy(x, y)
-            pdf.cell(col_width, 5, f"{rule_id}: {name[:20]}")
-
-    output_path = Path(__file__).parent / "RuleKeeper_Quick_Reference.pdf"
-    pdf.output(str(output_path))
-    print(f"Quick Reference PDF generated: {output_path}")
+    # Place each label where a left-aligned cell at (x, y) would put its
+    # baseline, writing text directly rather than a set_xy/cell pair per item
+    dx = pdf.c_margin
+    dy = 0.5 * _ID_LIST_ROW_HEIGHT + 0.3 * pdf.font_size
+    for x, y, label in _ID_LIST_ITEMS:
+        pdf.text(x + dx, y + dy, label)
+
+    _write_pdf(pdf, output_path)
+    _record_digest(output_path)
+    _report(f"Quick Reference PDF generated: {output_path}")
     return output_path
 
 
 # =============================================================================
 # PDF 2: DETAILED POLICY GUIDE
 # =============================================================================
-class DetailedGuidePDF(FPDF):
-    def __init__(self):
-        super().__init__()
-        self.set_auto_page_break(auto=True, margin=15)
+# severity -> (rule_box accent colour, badge label)
+_SEVERITY_STYLE = {
+    'critical': (_device_rgb(220, 53, 69), 'CRITICAL'),
+    'high': (_device_rgb(255, 153, 0), 'HIGH'),
+    'medium': (_device_rgb(255, 193, 7), 'MEDIUM'),
+    'low': (_device_rgb(40, 167, 69), 'LOW'),
+}
+_DEFAULT_ACCENT = _device_rgb(128, 128, 128)
+
+# Table of Contents rows: (category name, page number label)
+_TOC_ENTRIES = tuple(
+    (cat_name, str(page_num)) for page_num, (_, cat_name, _) in enumerate(CATEGORIES, start=3)
+)
+
+# Introduction legend: (badge label, badge colour, indented description)
+_GUIDE_SEVERITY_LEGEND = tuple(
+    (_SEVERITY_STYLE[severity][1], _SEVERITY_STYLE[severity][0], f"  {desc}") for severity, desc in (
+        ('critical', "Must be fixed immediately - security or compliance risk. Blocks deployment."),
+        ('high', "Should be fixed before deployment. Requires justification to override."),
+        ('medium', "Should be addressed in the current sprint. Warning only."),
+        ('low', "Best practice recommendation. Informational."),
+    )
+)
+
+
+def _build_detailed_render():
+    # zip() stops on `rules` before drawing from details_iter, so the shared
+    # iterator stays aligned with the next category
+    details_iter = iter(DETAILED_LIST)
+    return tuple(
+        (cat_name, tuple(
+            (rule_id, name, desc, severity,
+             details.get('pattern'), details.get('good'), details.get('bad'), details.get('fix_hint'))
+            for (rule_id, name, desc, severity), details in zip(rules, details_iter)
+        ))
+        for _, cat_name, rules in CATEGORIES
+    )
+
+
+# (cat_name, rule_box argument tuples) per chapter, joined once at import
+DETAILED_RENDER = _build_detailed_render()
+
+
+class DetailedGuidePDF(_RuleKeeperPDF):
+    def __init__(self, compress_level=1):
+        super().__init__(compress_level)
+        # rule_box starts on a new page when less than 77 mm of the page
+        # remains below the cursor; derived from the page height so it holds
+        # for formats other than A4 (where it is y > 220)
+        self._rule_box_break_y = self.h - 77
 
     def header(self):
         if self.page_no() > 1:
@@ -498,12 +682,6 @@ class DetailedGuidePDF(FPDF):
             self.cell(0, 8, 'RuleKeeper - Detailed Policy Guide', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             self.ln(2)
 
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Helvetica', 'I', 8)
-        self.set_text_color(128)
-        self.cell(0, 10, f'Page {self.page_no()}/{{nb}}', align='C')
-
     def chapter_title(self, title):
         self.set_font('Helvetica', 'B', 16)
         self.set_text_color(0, 51, 102)
@@ -533,45 +711,59 @@ class DetailedGuidePDF(FPDF):
         self.set_fill_color(245, 245, 245)
         self.set_font('Courier', '', 8)
         self.set_text_color(0)
-        self.multi_cell(0, 4, code, fill=True)
+        # Code is authored with explicit line breaks, so when the block fits on
+        # the page and no line is too long (Courier is monospaced, so that is
+        # a length check), paint one background and print a cell per line
+        # instead of word-wrapping. Anything else goes through multi_cell.
+        lines = code.split('\n')
+        height = 4 * len(lines)
+        # Same width multi_cell(0, ...) would use from the current cursor
+        w = self.w - self.r_margin - self.x
+        max_chars = int((w - 2 * self.c_margin) / self.get_string_width(' '))
+        if self.y + height > self.page_break_trigger or any(len(line) > max_chars for line in lines):
+            self.multi_cell(0, 4, code, fill=True)
+        else:
+            self.rect(self.x, self.y, w, height, style='F')
+            for line in lines:
+                self.cell(w, 4, line, new_x=XPos.LEFT, new_y=YPos.NEXT)
         self.ln(2)
 
+    def draw_severity_badge(self, label, color, h, font_size, align='L'):
+        self.set_fill_color(color)
+        self.set_text_color(255)
+        self.set_font('Helvetica', 'B', font_size)
+        self.cell(25, h, label, fill=True, align=align)
+
     def rule_box(self, rule_id, name, description, severity, pattern=None, good=None, bad=None, fix_hint=None):
-        severity_colors = {
-            'critical': (220, 53, 69),
-            'high': (255, 153, 0),
-            'medium': (255, 193, 7),
-            'low': (40, 167, 69)
-        }
-        color = severity_colors.get(severity, (128, 128, 128))
+        color, label = _SEVERITY_STYLE.get(severity) or (_DEFAULT_ACCENT, severity.upper())
 
         # Check if we need a new page
-        if self.get_y() > 220:
+        y_start = self.y
+        if y_start > self._rule_box_break_y:
             self.add_page()
-
-        y_start = self.get_y()
+            y_start = self.y
 
         # Rule header
-        self.set_draw_color(*color)
+        self.set_draw_color(color)
         self.set_line_width(0.8)
         self.line(10, y_start, 200, y_start)
 
-        self.set_xy(10, y_start + 2)
+        # Position directly; set_xy() only adds negative-offset handling
+        self.x = 10
+        self.y = y_start + 2
         self.set_font('Courier', 'B', 10)
-        self.set_text_color(*color)
+        self.set_text_color(color)
         self.cell(35, 5, rule_id)
 
         self.set_font('Helvetica', 'B', 10)
         self.set_text_color(0)
         self.cell(120, 5, name)
 
-        self.set_font('Helvetica', 'B', 8)
-        self.set_fill_color(*color)
-        self.set_text_color(255)
-        self.cell(25, 5, severity.upper(), fill=True, align='C')
+        self.draw_severity_badge(label, color, 5, 8, align='C')
 
         # Description
-        self.set_xy(10, y_start + 9)
+        self.x = 10
+        self.y = y_start + 9
         self.set_font('Helvetica', '', 9)
         self.set_text_color(80, 80, 80)
         self.multi_cell(190, 5, description)
@@ -599,7 +791,12 @@ class DetailedGuidePDF(FPDF):
         self.ln(5)
 
 
-def generate_detailed_guide():
+def generate_detailed_guide(cached=False):
+    output_path = _BASE_DIR / "RuleKeeper_Detailed_Guide.pdf"
+    if cached and _is_cached(output_path):
+        _report(f"Detailed Guide PDF up to date: {output_path}")
+        return output_path
+
     pdf = DetailedGuidePDF()
     pdf.alias_nb_pages()
 
@@ -636,13 +833,11 @@ def generate_detailed_guide():
     pdf.ln(5)
 
     pdf.set_font('Helvetica', '', 10)
-    page_num = 3
-    for cat_id, cat_name, rules in CATEGORIES:
+    for cat_name, page_label in _TOC_ENTRIES:
         pdf.set_text_color(0)
         pdf.cell(150, 6, cat_name)
         pdf.set_text_color(100)
-        pdf.cell(0, 6, str(page_num), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-        page_num += 1
+        pdf.cell(0, 6, page_label, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     # Introduction
     pdf.add_page()
@@ -667,40 +862,21 @@ def generate_detailed_guide():
 
     pdf.section_title('Severity Levels')
 
-    severities = [
-        ("CRITICAL", (220, 53, 69), "Must be fixed immediately - security or compliance risk. Blocks deployment."),
-        ("HIGH", (255, 153, 0), "Should be fixed before deployment. Requires justification to override."),
-        ("MEDIUM", (255, 193, 7), "Should be addressed in the current sprint. Warning only."),
-        ("LOW", (40, 167, 69), "Best practice recommendation. Informational."),
-    ]
-
-    for name, color, desc in severities:
-        pdf.set_fill_color(*color)
-        pdf.set_text_color(255)
-        pdf.set_font('Helvetica', 'B', 10)
-        pdf.cell(25, 7, name, fill=True)
+    for label, color, desc in _GUIDE_SEVERITY_LEGEND:
+        pdf.draw_severity_badge(label, color, 7, 10)
         pdf.set_text_color(0)
         pdf.set_font('Helvetica', '', 9)
-        pdf.cell(0, 7, f"  {desc}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(0, 7, desc, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.ln(1)
 
     # Policy Categories
-    for cat_id, cat_name, rules in CATEGORIES:
+    rule_box = pdf.rule_box
+    for cat_name, rows in DETAILED_RENDER:
         pdf.add_page()
         pdf.chapter_title(cat_name)
 
-        for rule_id, name, desc, severity in rules:
-            details = DETAILED_RULES.get(rule_id, {})
-            pdf.rule_box(
-                rule_id=rule_id,
-                name=name,
-                description=desc,
-                severity=severity,
-                pattern=details.get('pattern'),
-                good=details.get('good'),
-                bad=details.get('bad'),
-                fix_hint=details.get('fix_hint')
-            )
+        for row in rows:
+            rule_box(*row)
 
     # Appendix: YAML Example
     pdf.add_page()
@@ -745,9 +921,9 @@ coding_standards:
       parameters:
         max_lines: 50  # Custom parameter""")
 
-    output_path = Path(__file__).parent / "RuleKeeper_Detailed_Guide.pdf"
-    pdf.output(str(output_path))
-    print(f"Detailed Guide PDF generated: {output_path}")
+    _write_pdf(pdf, output_path)
+    _record_digest(output_path)
+    _report(f"Detailed Guide PDF generated: {output_path}")
     return output_path
 
 
@@ -755,9 +931,22 @@ coding_standards:
 # MAIN
 # =============================================================================
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the RuleKeeper PDF guides.")
+    parser.add_argument("--cached", action="store_true",
+                        help="skip PDFs already generated from the current script")
+    args = parser.parse_args()
+
     print("Generating RuleKeeper PDFs...")
+    # Flush before the pool starts so workers cannot inherit buffered output
+    print(flush=True)
+    # The two documents share no state, so build them in parallel
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(generate_quick_reference, args.cached),
+                   executor.submit(generate_detailed_guide, args.cached)]
+        for future in futures:
+            future.result()
     print()
-    generate_quick_reference()
-    generate_detailed_guide()
-    print()
-    print("Done! Both PDFs have been generated.")
+    if args.cached:
+        print("Done! Both PDFs are up to date.")
+    else:
+        print("Done! Both PDFs have been generated.")